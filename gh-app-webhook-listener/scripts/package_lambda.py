@@ -16,6 +16,13 @@ PROJECT_ROOT = Path(__file__).parent.parent
 SRC_DIR = PROJECT_ROOT / "src"
 BUILD_DIR = PROJECT_ROOT / "build"
 
+# Python version of each Lambda runtime (see terraform/lambda_*.tf). Wheels
+# with compiled extensions, such as orjson, must match the runtime's ABI.
+LAMBDA_PYTHON_VERSIONS = {
+    "webhook_handler": "311",
+    "check_processor": "312",
+}
+
 
 def clean_build_directory():
     """Clean build directory."""
@@ -24,8 +31,8 @@ def clean_build_directory():
     BUILD_DIR.mkdir(exist_ok=True)
 
 
-def install_dependencies(requirements_file: Path, target_dir: Path):
-    """Install dependencies to target directory."""
+def install_dependencies(requirements_file: Path, target_dir: Path, python_version: str):
+    """Install dependencies built for the given Lambda Python version to target directory."""
     if requirements_file.exists():
         print(f"  Installing dependencies from {requirements_file.name}")
         subprocess.run([
@@ -33,6 +40,9 @@ def install_dependencies(requirements_file: Path, target_dir: Path):
             "-r", str(requirements_file),
             "-t", str(target_dir),
             "--platform", "manylinux2014_x86_64",
+            "--python-version", python_version,
+            "--implementation", "cp",
+            "--abi", f"cp{python_version}",
             "--only-binary", ":all:",
             "--upgrade"
         ], check=True)
@@ -67,7 +77,7 @@ def package_lambda(function_name: str):
 
     # Install dependencies from Lambda-specific requirements
     requirements = lambda_src / "requirements.txt"
-    install_dependencies(requirements, function_build_dir)
+    install_dependencies(requirements, function_build_dir, LAMBDA_PYTHON_VERSIONS[function_name])
 
     # Create ZIP file
     zip_path = BUILD_DIR / f"{function_name}.zip"
@@ -1,14 +1,18 @@
-import json
 import os
+import re
+import time
 import fnmatch
+import functools
 import logging
 from dataclasses import dataclass
-from typing import Any, Dict, List, Optional, Iterable, Callable
+from itertools import chain
+from typing import Any, Dict, List, Optional, Iterable, Callable, Tuple
 
 import boto3
 
 import sys
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from common import json_io
 from common.github_client import GitHubClient
 from common.workflow_trigger import WorkflowTrigger
 
@@ -18,6 +22,16 @@ logger.setLevel(logging.INFO)
 
 _s3 = boto3.client("s3")
 
+# Reused across warm invocations; created on first use (see _get_workflow_trigger).
+# Its App private key is re-read every CACHE_PRIVATE_KEY_TTL seconds so a rotated key is picked up.
+_PRIVATE_KEY_CACHE_TTL = float(os.environ.get("CACHE_PRIVATE_KEY_TTL", "300"))
+_workflow_trigger: Optional[WorkflowTrigger] = None
+_workflow_trigger_expires = 0.0
+
+# Loaded configs per (bucket, key); CACHE_CONFIG_TTL=0 disables the cache.
+_CONFIG_CACHE_TTL = float(os.environ.get("CACHE_CONFIG_TTL", "300"))
+_config_cache: Dict[Tuple[str, str], Tuple[float, Dict[str, Any]]] = {}
+
 
 # =============================
 # Models
@@ -60,32 +74,79 @@ def load_config_from_s3(bucket: Optional[str], key: Optional[str]) -> Dict[str,
         logger.error("CONFIG_BUCKET_NAME or CONFIG_FILE_KEY missing")
         return {}
 
+    cached = _config_cache.get((bucket, key))
+    if cached and time.monotonic() < cached[0]:
+        return cached[1]
+
     try:
         obj = _s3.get_object(Bucket=bucket, Key=key)
-        return json.loads(obj["Body"].read().decode("utf-8"))
+        config = _prepare_config(json_io.loads(obj["Body"].read()))
     except Exception as e:
         logger.error("Failed to load config from S3: %s", e, exc_info=True)
         return {}
 
+    _config_cache[(bucket, key)] = (time.monotonic() + _CONFIG_CACHE_TTL, config)
+    return config
+
+
+def _prepare_config(config: Dict[str, Any]) -> Dict[str, Any]:
+    """Normalize the config once at load time so per-record matching stays cheap."""
+    for mapping in config.get("event_mappings", []):
+        actions = mapping.get("actions")
+        if actions:
+            mapping["actions"] = frozenset(actions)
+    return config
+
+
+# =============================
+# GitHub client
+# =============================
+
+def _get_workflow_trigger() -> WorkflowTrigger:
+    """
+    Return the container-wide WorkflowTrigger, building it on first use.
+    The App private key is fetched from Secrets Manager once per
+    CACHE_PRIVATE_KEY_TTL, not per batch. Refreshing it keeps the same
+    client, so its installation token and pooled session survive.
+    """
+    global _workflow_trigger, _workflow_trigger_expires
+    if _workflow_trigger is None:
+        _workflow_trigger = WorkflowTrigger(GitHubClient())
+        _workflow_trigger_expires = time.monotonic() + _PRIVATE_KEY_CACHE_TTL
+    elif time.monotonic() >= _workflow_trigger_expires:
+        _workflow_trigger.github_client.refresh_private_key()
+        _workflow_trigger_expires = time.monotonic() + _PRIVATE_KEY_CACHE_TTL
+    return _workflow_trigger
+
 
 # =============================
 # Utilities
 # =============================
 
 def _strip_ref(ref: str) -> str:
-    return (ref or "").replace("refs/heads/", "")
+    return (ref or "").removeprefix("refs/heads/")
+
+@functools.lru_cache(maxsize=1024)
+def _compile_patterns(patterns: Tuple[str, ...]) -> "re.Pattern[str]":
+    """Compile glob patterns into one alternation, so a single regex walk tests them all."""
+    return re.compile("|".join(fnmatch.translate(p or "") for p in patterns))
 
 def _match(value: str, pattern: str) -> bool:
-    return fnmatch.fnmatch(value or "", pattern or "")
+    return _compile_patterns((pattern or "",)).match(value or "") is not None
 
 def _any_match(value: str, patterns: Iterable[str]) -> bool:
-    return any(_match(value, p) for p in patterns)
+    patterns = tuple(patterns)
+    if not patterns:
+        return False
+    return _compile_patterns(patterns).match(value or "") is not None
+
+_PLACEHOLDER_RE = re.compile(r"\{(\w+)\}")
 
 def _substitute(value: Any, variables: Dict[str, str]) -> Any:
     if isinstance(value, str):
-        for k, v in variables.items():
-            value = value.replace(f"{{{k}}}", v)
-        return value
+        if "{" not in value:
+            return value
+        return _PLACEHOLDER_RE.sub(lambda m: variables.get(m.group(1), m.group(0)), value)
     if isinstance(value, dict):
         return {k: _substitute(v, variables) for k, v in value.items()}
     if isinstance(value, list):
@@ -98,17 +159,18 @@ def _substitute(value: Any, variables: Dict[str, str]) -> Any:
 # =============================
 
 def get_changed_files_from_push(payload: Dict[str, Any]) -> List[str]:
-    changed = set()
-    for commit in payload.get("commits", []):
-        changed.update(commit.get("added", []))
-        changed.update(commit.get("modified", []))
-        changed.update(commit.get("removed", []))
-    return list(changed)
+    return list({
+        f
+        for commit in payload.get("commits", ())
+        for f in chain(commit.get("added", ()), commit.get("modified", ()), commit.get("removed", ()))
+    })
 
 def matches_file_patterns(changed_files: List[str], patterns: List[str]) -> bool:
     if not patterns:
         return True
-    return any(fnmatch.fnmatch(f, p) for f in changed_files for p in patterns)
+    # Scan the files in a single pass instead of re-running fnmatch for each (file, pattern) pair
+    compiled = _compile_patterns(tuple(patterns))
+    return any(compiled.match(f) for f in changed_files)
 
 
 # =============================
@@ -339,27 +401,23 @@ def find_matching_workflows(ev: NormalizedEvent, config: Dict[str, Any]) -> List
 # Lambda handler
 # =============================
 
-def handler(event: Dict[str, Any], context: Any) -> Dict[str, Any]:
-    logger.info("Processing %d SQS records", len(event.get("Records", [])))
-
-    config = load_config_from_s3(
-        os.environ.get("CONFIG_BUCKET_NAME"),
-        os.environ.get("CONFIG_FILE_KEY", "github_events_config.json"),
-    )
-    if not config:
-        return {"statusCode": 500, "body": json.dumps({"error": "Config not found"})}
-
-    fail_on_error = str(os.environ.get("FAIL_ON_ERROR", "false")).lower() == "true"
+def handle_batch(records: List[Dict[str, Any]], config: Dict[str, Any]) -> Tuple[int, int, List[str]]:
+    """
+    Process a batch of SQS records in one invocation.
 
-    github_client = GitHubClient()
-    workflow_trigger = WorkflowTrigger(github_client)
+    All records share the container-wide WorkflowTrigger, so a batch pays
+    for GitHub client setup (token, TLS connection) at most once.
 
+    Returns (processed, errors, failed message IDs).
+    """
     processed = 0
     errors = 0
+    failed: List[str] = []
 
-    for record in event.get("Records", []):
+    for record in records:
+        record_errors = errors
         try:
-            ev = normalize_event(json.loads(record.get("body", "{}")))
+            ev = normalize_event(json_io.loads(record.get("body", "{}")))
             workflows = find_matching_workflows(ev, config)
 
             if not workflows:
@@ -380,16 +438,21 @@ def handler(event: Dict[str, Any], context: Any) -> Dict[str, Any]:
                 "check_suite_id": ev.check_suite_id,
             }
 
+            # Resolved only once a record matches: most events never need GitHub.
+            workflow_trigger = _get_workflow_trigger()
+
             for wf in workflows:
                 try:
                     rendered = _substitute(wf, vars_)
-                    workflow_trigger.trigger_workflow(
+                    if not workflow_trigger.trigger_workflow(
                         owner=rendered["owner"],
                         repo=rendered["repository"],
                         workflow_file=rendered["workflow_file"],
                         ref=rendered.get("ref", "main"),
                         inputs=rendered.get("inputs", {}),
-                    )
+                    ):
+                        errors += 1
+                        logger.error("Workflow %s was not triggered", rendered["workflow_file"])
                 except Exception:
                     errors += 1
                     logger.exception("Workflow trigger error")
@@ -400,10 +463,37 @@ def handler(event: Dict[str, Any], context: Any) -> Dict[str, Any]:
             errors += 1
             logger.exception("Error processing record")
 
-    if errors and fail_on_error:
-        raise RuntimeError(f"Processing completed with {errors} errors (FAIL_ON_ERROR=true)")
+        if errors > record_errors:
+            failed.append(record.get("messageId", ""))
+
+    return processed, errors, failed
+
+
+def handler(event: Dict[str, Any], context: Any) -> Dict[str, Any]:
+    records = event.get("Records", [])
+    logger.info("Processing %d SQS records", len(records))
+
+    config = load_config_from_s3(
+        os.environ.get("CONFIG_BUCKET_NAME"),
+        os.environ.get("CONFIG_FILE_KEY", "github_events_config.json"),
+    )
+    if not config:
+        return {"statusCode": 500, "body": json_io.dumps({"error": "Config not found"})}
 
-    return {
+    fail_on_error = str(os.environ.get("FAIL_ON_ERROR", "false")).lower() == "true"
+
+    processed, errors, failed = handle_batch(records, config)
+
+    response = {
         "statusCode": 200,
-        "body": json.dumps({"processed": processed, "errors": errors}),
+        "body": json_io.dumps({"processed": processed, "errors": errors}),
     }
+
+    # With ReportBatchItemFailures only the failed records return to the queue,
+    # so records that already dispatched their workflows are not retried
+    if failed and fail_on_error:
+        logger.error("Processing completed with %d errors; returning %d records to the queue (FAIL_ON_ERROR=true)",
+                     errors, len(failed))
+        response["batchItemFailures"] = [{"itemIdentifier": message_id} for message_id in failed]
+
+    return response
@@ -1,13 +1,18 @@
 import os
 import time
+import calendar
 import logging
 import requests
+from requests.adapters import HTTPAdapter
 import jwt
 import boto3
 from typing import Dict, Any, Optional
 
 logger = logging.getLogger()
 
+# Refresh installation tokens this many seconds before GitHub expires them
+TOKEN_REFRESH_MARGIN = 300
+
 
 class GitHubClient:
     """Client for interacting with GitHub API as a GitHub App."""
@@ -17,6 +22,16 @@ class GitHubClient:
         self.installation_id = os.environ.get('GITHUB_INSTALLATION_ID')
         self.private_key = self._get_private_key()
         self.base_url = "https://api.github.com"
+        self._session = self._create_session()
+        self._token: Optional[str] = None
+        self._token_expires_at = 0.0
+
+    @staticmethod
+    def _create_session() -> requests.Session:
+        """Create a pooled HTTP session so API calls reuse the same TLS connection."""
+        session = requests.Session()
+        session.mount('https://', HTTPAdapter(pool_connections=5, pool_maxsize=10))
+        return session
 
     def _get_private_key(self) -> str:
         """Retrieve GitHub App private key from Secrets Manager."""
@@ -30,6 +45,14 @@ class GitHubClient:
             logger.error(f"Failed to retrieve GitHub App private key: {e}")
             raise
 
+    def refresh_private_key(self) -> None:
+        """
+        Re-read the App private key so a rotated key is picked up.
+        The key only signs the JWT used to mint installation tokens, so the
+        cached token and pooled session stay in use.
+        """
+        self.private_key = self._get_private_key()
+
     def _create_jwt(self) -> str:
         """Create a JWT for GitHub App authentication."""
         now = int(time.time())
@@ -41,8 +64,19 @@ class GitHubClient:
 
         return jwt.encode(payload, self.private_key, algorithm='RS256')
 
+    @staticmethod
+    def _parse_expires_at(expires_at: Optional[str]) -> float:
+        """Convert GitHub's fixed-format UTC timestamp (2016-07-11T22:14:10Z) to epoch seconds."""
+        try:
+            return float(calendar.timegm(time.strptime(expires_at, '%Y-%m-%dT%H:%M:%SZ')))
+        except (TypeError, ValueError):
+            return 0.0
+
     def _get_installation_token(self) -> str:
-        """Get an installation access token."""
+        """Get an installation access token, reusing the current one until it is close to expiry."""
+        if self._token and time.time() < self._token_expires_at - TOKEN_REFRESH_MARGIN:
+            return self._token
+
         jwt_token = self._create_jwt()
         if not jwt_token:
             raise ValueError("Failed to create JWT token")
@@ -55,22 +89,35 @@ class GitHubClient:
         url = f"{self.base_url}/app/installations/{self.installation_id}/access_tokens"
 
         try:
-            response = requests.post(url, headers=headers)
+            response = self._session.post(url, headers=headers)
             response.raise_for_status()
-            return response.json()['token']
+            data = response.json()
         except requests.exceptions.RequestException as e:
             logger.error(f"Failed to get installation token: {e}")
             raise
 
-    def make_request(self, method: str, endpoint: str, **kwargs) -> Dict[str, Any]:
-        """Make an authenticated request to GitHub API."""
-        token = self._get_installation_token()
+        self._token = data['token']
+        self._token_expires_at = self._parse_expires_at(data.get('expires_at'))
+        return self._token
 
-        headers = kwargs.pop('headers', {})
+    def _invalidate_token(self) -> None:
+        """Forget the cached installation token so the next request fetches a new one."""
+        self._token = None
+        self._token_expires_at = 0.0
+
+    def _send(self, method: str, url: str, headers: Dict[str, str], **kwargs) -> requests.Response:
+        """Send a request authenticated with the current installation token."""
+        token = self._get_installation_token()
+        headers = dict(headers)
         headers.update({
             'Authorization': f'token {token}',
             'Accept': 'application/vnd.github.v3+json'
         })
+        return self._session.request(method, url, headers=headers, **kwargs)
+
+    def make_request(self, method: str, endpoint: str, **kwargs) -> Dict[str, Any]:
+        """Make an authenticated request to GitHub API."""
+        headers = kwargs.pop('headers', {})
 
         # Ensure proper URL construction with slash
         if not endpoint.startswith('/'):
@@ -78,7 +125,12 @@ class GitHubClient:
         url = f"{self.base_url}{endpoint}"
 
         try:
-            response = requests.request(method, url, headers=headers, **kwargs)
+            response = self._send(method, url, headers, **kwargs)
+            if response.status_code == 401:
+                # The cached token was revoked (app reinstalled, permissions changed): retry once with a new one
+                logger.warning("GitHub rejected the installation token; refreshing it and retrying")
+                self._invalidate_token()
+                response = self._send(method, url, headers, **kwargs)
             response.raise_for_status()
             return response.json() if response.text else {}
         except requests.exceptions.RequestException as e:
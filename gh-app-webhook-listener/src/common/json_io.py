@@ -0,0 +1,18 @@
+import orjson
+
+# JSON (de)serialization shared by the Lambda handlers, backed by orjson.
+# loads() accepts bytes or str; dumps() returns str for API and SQS bodies.
+loads = orjson.loads
+
+
+def dumps(obj) -> str:
+    """
+    Serialize an object to a compact JSON string.
+
+    Args:
+        obj: The object to serialize
+
+    Returns:
+        The JSON document as a str
+    """
+    return orjson.dumps(obj).decode('utf-8')
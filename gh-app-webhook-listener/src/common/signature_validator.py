@@ -0,0 +1,157 @@
+import hmac
+import hashlib
+import functools
+import logging
+import threading
+import time
+
+logger = logging.getLogger()
+
+SIGNATURE_PREFIX = 'sha256='
+
+# GitHub redelivers the same payload under the same X-GitHub-Delivery ID
+# when a delivery times out, so recently verified deliveries are remembered
+# for a short while. The cache is per Lambda container and holds request
+# bodies, so it is bounded by entry count, per-body size and total bytes.
+VERIFIED_CACHE_TTL = 60
+VERIFIED_CACHE_MAXSIZE = 1024
+VERIFIED_CACHE_MAX_BODY_BYTES = 64 * 1024
+VERIFIED_CACHE_MAX_BYTES = 1024 * 1024
+
+# Insertion order is expiry order (fixed TTL), so the oldest entry is first
+_verified = {}
+_verified_bytes = 0
+_verified_lock = threading.Lock()
+
+
+@functools.lru_cache(maxsize=8)
+def _keyed_hmac(secret: str) -> "hmac.HMAC":
+    """
+    Return an HMAC-SHA256 object already keyed with the secret.
+
+    Keying (padding the secret and hashing the inner/outer pads) only
+    depends on the secret, so it is done once and each request works on
+    a cheap copy of the prepared state.
+    """
+    return hmac.new(secret.encode('utf-8'), digestmod=hashlib.sha256)
+
+
+def fast_sign(payload: bytes, secret: str) -> bytes:
+    """
+    Compute the raw HMAC-SHA256 digest of a payload.
+
+    Args:
+        payload: The raw request body bytes
+        secret: The webhook secret
+
+    Returns:
+        The 32-byte digest
+    """
+    mac = _keyed_hmac(secret).copy()
+    mac.update(payload)
+    return mac.digest()
+
+
+def validate_github_signature(payload: bytes, signature: str, secret: str) -> bool:
+    """
+    Validate a GitHub webhook signature (X-Hub-Signature-256 header).
+
+    Args:
+        payload: The raw request body bytes
+        signature: The signature header value (sha256=...)
+        secret: The webhook secret
+
+    Returns:
+        True if the signature is valid, False otherwise
+    """
+    if not signature or not secret:
+        logger.warning("Missing signature or secret")
+        return False
+
+    # The signature is sent with the 'sha256=' prefix
+    if not signature.startswith(SIGNATURE_PREFIX):
+        logger.warning("Invalid signature format")
+        return False
+
+    try:
+        provided = bytes.fromhex(signature[len(SIGNATURE_PREFIX):])
+    except ValueError:
+        logger.warning("Invalid signature format")
+        return False
+
+    expected = fast_sign(payload, secret)
+
+    # Compare the raw 32-byte digests rather than their hex encodings
+    is_valid = hmac.compare_digest(expected, provided)
+
+    if not is_valid:
+        logger.warning("Signature validation failed")
+
+    return is_valid
+
+
+def _clear_verified_cache() -> None:
+    """Drop every remembered delivery."""
+    global _verified_bytes
+    with _verified_lock:
+        _verified.clear()
+        _verified_bytes = 0
+
+
+def _evict_verified(now: float) -> None:
+    """Drop expired entries, then the oldest ones until the size limits hold. Caller holds the lock."""
+    global _verified_bytes
+    while _verified:
+        oldest = next(iter(_verified))
+        expires, body = _verified[oldest]
+        if (expires > now and len(_verified) <= VERIFIED_CACHE_MAXSIZE
+                and _verified_bytes <= VERIFIED_CACHE_MAX_BYTES):
+            break
+        del _verified[oldest]
+        _verified_bytes -= len(body)
+
+
+def verify_cached(payload: bytes, signature: str, secret: str, delivery_id: str) -> bool:
+    """
+    Validate a GitHub webhook signature, reusing the result for redeliveries.
+
+    Successful validations are cached under (delivery_id, signature). A hit
+    is only trusted when the payload is identical to the one that was
+    verified, so a replayed delivery ID and signature with a different body
+    still goes through full HMAC validation and fails. Bodies larger than
+    VERIFIED_CACHE_MAX_BODY_BYTES are never cached.
+
+    Args:
+        payload: The raw request body bytes
+        signature: The signature header value (sha256=...)
+        secret: The webhook secret
+        delivery_id: The X-GitHub-Delivery header value
+
+    Returns:
+        True if the signature is valid, False otherwise
+    """
+    global _verified_bytes
+
+    if not delivery_id or len(payload) > VERIFIED_CACHE_MAX_BODY_BYTES:
+        return validate_github_signature(payload, signature, secret)
+
+    key = (delivery_id, signature, secret)
+    now = time.monotonic()
+
+    with _verified_lock:
+        entry = _verified.get(key)
+    if entry is not None and entry[0] > now and entry[1] == payload:
+        return True
+
+    if not validate_github_signature(payload, signature, secret):
+        return False
+
+    with _verified_lock:
+        previous = _verified.pop(key, None)
+        if previous is not None:
+            _verified_bytes -= len(previous[1])
+        _verified[key] = (now + VERIFIED_CACHE_TTL, payload)
+        _verified_bytes += len(payload)
+        _evict_verified(now)
+
+    return True
@@ -1,73 +1,97 @@
-import json
 import os
+import time
+import base64
 import boto3
+import orjson
+from botocore.config import Config
 import logging
-from typing import Dict, Any
-import hmac
-import hashlib
+from typing import Dict, Any, Optional
+
+import sys
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from common import json_io
+from common.signature_validator import verify_cached
 
 logger = logging.getLogger()
 logger.setLevel(logging.INFO)
 
+# Short timeouts (1s connect + 2s read) replace botocore's 60s defaults, so a
+# stalled connection fails fast and is retried. GitHub does not redeliver a
+# failed webhook on its own, so each call gets three attempts: a transient
+# SQS error costs a retry instead of the event. A healthy call stays well
+# inside GitHub's 10 second delivery timeout; the worst case is about 9s per
+# call plus backoff, and an event enqueued late is still processed.
+_AWS_CLIENT_CONFIG = Config(
+    connect_timeout=1,
+    read_timeout=2,
+    retries={'max_attempts': 3, 'mode': 'standard'},
+)
+
+_secretsmanager = boto3.client('secretsmanager', config=_AWS_CLIENT_CONFIG)
+_sqs = boto3.client('sqs', config=_AWS_CLIENT_CONFIG)
+_QUEUE_URL = os.environ.get('SQS_QUEUE_URL')
+
+# The webhook secret is cached per container; CACHE_SECRET_TTL=0 disables the cache.
+_SECRET_CACHE_TTL = float(os.environ.get('CACHE_SECRET_TTL', '300'))
+_secret_cache: Optional[str] = None
+_secret_cache_expires = 0.0
+
+# Fixed error response bodies, serialized once per container
+_MISSING_SIGNATURE_BODY = json_io.dumps({'error': 'Missing signature'})
+_INVALID_SIGNATURE_BODY = json_io.dumps({'error': 'Invalid signature'})
+_INVALID_PAYLOAD_BODY = json_io.dumps({'error': 'Invalid JSON payload'})
+_INTERNAL_ERROR_BODY = json_io.dumps({'error': 'Internal server error'})
 
-def validate_github_signature(payload: str, signature: str, secret: str) -> bool:
-    """
-    Validate signature.
 
-    Args:
-        payload: The raw payload
-        signature: The signature
-        secret: The secret
+def get_webhook_secret() -> str:
+    """Retrieve webhook secret from AWS Secrets Manager, reusing it for CACHE_SECRET_TTL seconds."""
+    global _secret_cache, _secret_cache_expires
 
-    Returns:
-        True if the signature is valid, False otherwise
-    """
-    if not signature or not secret:
-        logger.warning("Missing signature or secret")
-        return False
+    if _secret_cache is not None and time.monotonic() < _secret_cache_expires:
+        return _secret_cache
 
-    # The signature is sent with the 'sha256=' prefix
-    if not signature.startswith('sha256='):
-        logger.warning("Invalid signature format")
-        return False
+    try:
+        response = _secretsmanager.get_secret_value(SecretId=os.environ['WEBHOOK_SECRET_ARN'])
+    except Exception as e:
+        logger.error(f"Failed to retrieve webhook secret: {e}")
+        raise
 
-    is_valid = hmac.compare_digest(generate_signature(payload, secret), signature)
+    _secret_cache = response['SecretString']
+    _secret_cache_expires = time.monotonic() + _SECRET_CACHE_TTL
+    return _secret_cache
 
-    if not is_valid:
-        logger.warning("Signature validation failed")
 
-    return is_valid
+def _response(status_code: int, body: str) -> Dict[str, Any]:
+    """Build an API Gateway proxy response."""
+    return {'statusCode': status_code, 'body': body}
 
 
-def generate_signature(payload: str, secret: str) -> str:
+def _enqueue(github_event: str, action: str, delivery_id: str, body_bytes: bytes) -> None:
     """
-    Generate a signature.
-
-    Args:
-        payload: The payload to sign
-        secret: The secret
+    Send a webhook event to SQS for asynchronous processing.
 
-    Returns:
-        The signature in format (sha256=...)
+    The already-validated raw body is spliced in as "payload" instead of
+    re-serializing the parsed dict; the check processor parses it anyway.
     """
-    signature = hmac.new(
-        secret.encode('utf-8'),
-        payload.encode('utf-8') if isinstance(payload, str) else payload,
-        hashlib.sha256
-    ).hexdigest()
-
-    return f"sha256={signature}"
-
-
-def get_webhook_secret() -> str:
-    """Retrieve webhook secret from AWS Secrets Manager."""
-    try:
-        secrets_manager = boto3.client('secretsmanager')
-        response = secrets_manager.get_secret_value(SecretId=os.environ['WEBHOOK_SECRET_ARN'])
-        return response['SecretString']
-    except Exception as e:
-        logger.error(f"Failed to retrieve webhook secret: {e}")
-        raise
+    envelope = orjson.dumps({
+        'event_type': github_event,
+        'action': action,
+        'delivery_id': delivery_id,
+    })
+    message = envelope[:-1] + b',"payload":' + body_bytes + b'}'
+
+    msg_attrs = {
+        'event_type': {'DataType': 'String', 'StringValue': github_event},
+        'delivery_id': {'DataType': 'String', 'StringValue': delivery_id or 'unknown'},
+    }
+    if action:
+        msg_attrs['action'] = {'DataType': 'String', 'StringValue': action}
+
+    _sqs.send_message(
+        QueueUrl=_QUEUE_URL,
+        MessageBody=message.decode('utf-8'),
+        MessageAttributes=msg_attrs,
+    )
 
 
 def handler(event: Dict[str, Any], context: Any) -> Dict[str, Any]:
@@ -82,88 +106,60 @@ def handler(event: Dict[str, Any], context: Any) -> Dict[str, Any]:
         API Gateway response object
     """
     try:
-        # Log incoming event
-        logger.info(f"Received webhook event: {json.dumps(event)}")
-        logger.info(f"Received webhook event headers: {json.dumps(event.get('headers', {}))}")
-
-        # Extract request details
-        body = event.get('body', '')
+        # Extract request details; the raw body bytes are what GitHub signed
+        body = event.get('body') or ''
+        if event.get('isBase64Encoded'):
+            body_bytes = base64.b64decode(body)
+        else:
+            body_bytes = body.encode('utf-8')
         headers = event.get('headers', {})
 
         # Convert headers to lowercase for consistent access (API Gateway sometimes sends mixed case)
         headers_lower = {k.lower(): v for k, v in headers.items()}
 
-        # Get GitHub event type
-        github_event = headers_lower.get('x-github-event', '')
-        delivery_id = headers_lower.get('x-github-delivery', '')
-
-        logger.info(f"GitHub event: {github_event}, Delivery ID: {delivery_id}")
-
-        # Validate webhook signature
+        # Validate webhook signature before doing any work on the payload,
+        # so forged or unsigned requests are rejected as cheaply as possible
         signature = headers_lower.get('x-hub-signature-256', '')
         if not signature:
             logger.error("Missing GitHub signature header")
-            return {
-                'statusCode': 401,
-                'body': json.dumps({'error': 'Missing signature'})
-            }
+            return _response(401, _MISSING_SIGNATURE_BODY)
 
         webhook_secret = get_webhook_secret()
-        if not validate_github_signature(body, signature, webhook_secret):
+        delivery_id = headers_lower.get('x-github-delivery', '')
+        if not verify_cached(body_bytes, signature, webhook_secret, delivery_id):
             logger.error("Invalid GitHub signature")
-            return {
-                'statusCode': 401,
-                'body': json.dumps({'error': 'Invalid signature'})
-            }
+            return _response(401, _INVALID_SIGNATURE_BODY)
+
+        # Full event dumps are only rendered when debug logging is enabled
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug("Received webhook event: %s", event)
+
+        # Get GitHub event type
+        github_event = headers_lower.get('x-github-event', '')
+
+        logger.info("GitHub event: %s, Delivery ID: %s, Body bytes: %d",
+                    github_event, delivery_id, len(body_bytes))
 
         try:
-            payload = json.loads(body) if isinstance(body, str) else body
-        except json.JSONDecodeError as e:
+            payload = orjson.loads(body_bytes)
+        except orjson.JSONDecodeError as e:
             logger.error(f"Failed to parse webhook payload: {e}")
-            return {
-                'statusCode': 400,
-                'body': json.dumps({'error': 'Invalid JSON payload'})
-            }
+            return _response(400, _INVALID_PAYLOAD_BODY)
 
         action = payload.get('action', '')
         logger.info(f"Processing action: {action}")
 
         # Send to SQS for async processing
-        message = {
-            'event_type': github_event,
-            'action': action,
-            'delivery_id': delivery_id,
-            'payload': payload,
-        }
-
-        sqs = boto3.client('sqs')
-        msg_attrs = {
-            'event_type': {'DataType': 'String', 'StringValue': github_event},
-            'delivery_id': {'DataType': 'String', 'StringValue': delivery_id or 'unknown'},
-        }
-        if action:
-            msg_attrs['action'] = {'DataType': 'String', 'StringValue': action}
-
-        sqs.send_message(
-            QueueUrl=os.environ['SQS_QUEUE_URL'],
-            MessageBody=json.dumps(message),
-            MessageAttributes=msg_attrs,
-        )
+        _enqueue(github_event, action, delivery_id, body_bytes)
 
         logger.info(f"Queued {github_event} event for processing: {delivery_id}")
 
         # Return success immediately
-        return {
-            'statusCode': 200,
-            'body': json.dumps({
-                'message': 'Webhook received',
-                'delivery_id': delivery_id
-            })
-        }
+        return _response(200, json_io.dumps({
+            'message': 'Webhook received',
+            'delivery_id': delivery_id
+        }))
 
     except Exception as e:
         logger.error(f"Unexpected error processing webhook: {e}", exc_info=True)
-        return {
-            'statusCode': 500,
-            'body': json.dumps({'error': 'Internal server error'})
-        }
+        return _response(500, _INTERNAL_ERROR_BODY)
@@ -181,6 +181,9 @@ resource "aws_cloudwatch_log_group" "check_processor_logs" {
 resource "aws_lambda_event_source_mapping" "check_processor_sqs" {
   event_source_arn                   = aws_sqs_queue.check_suite.arn
   function_name                      = aws_lambda_function.check_processor.arn
-  batch_size                         = 1
-  maximum_batching_window_in_seconds = 0
+  batch_size                         = var.sqs_batch_size
+  maximum_batching_window_in_seconds = var.sqs_batching_window_seconds
+
+  # The handler reports failed records individually, so a batch is never retried whole
+  function_response_types = ["ReportBatchItemFailures"]
 }
\ No newline at end of file
@@ -5,7 +5,8 @@ resource "null_resource" "webhook_handler_prep" {
   triggers = {
     src_hash = sha256(join("", [
       fileexists("${local.src_dir}/webhook_handler/handler.py") ? filesha256("${local.src_dir}/webhook_handler/handler.py") : "",
-      fileexists("${local.src_dir}/webhook_handler/requirements.txt") ? filesha256("${local.src_dir}/webhook_handler/requirements.txt") : ""
+      fileexists("${local.src_dir}/webhook_handler/requirements.txt") ? filesha256("${local.src_dir}/webhook_handler/requirements.txt") : "",
+      sha256(join("", [for f in fileset("${local.src_dir}/common", "*.py") : filesha256("${local.src_dir}/common/${f}")]))
     ]))
   }
 
@@ -29,7 +30,7 @@ resource "null_resource" "webhook_handler_copy" {
   provisioner "local-exec" {
     command = <<-EOT
       cp -r "${local.src_dir}/webhook_handler" "${local.build_root}/webhook_handler_build/"
-      # cp -r "${local.src_dir}/common" "${local.build_root}/webhook_handler_build/"
+      cp -r "${local.src_dir}/common" "${local.build_root}/webhook_handler_build/"
     EOT
     interpreter = ["bash", "-c"]
   }
@@ -49,6 +50,9 @@ resource "null_resource" "webhook_handler_deps" {
         python -m pip install -r "${local.src_dir}/webhook_handler/requirements.txt" \
           -t "${local.build_root}/webhook_handler_build" \
           --platform manylinux2014_x86_64 \
+          --python-version 311 \
+          --implementation cp \
+          --abi cp311 \
           --only-binary :all: \
           --upgrade
       fi
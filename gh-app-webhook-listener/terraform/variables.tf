@@ -66,6 +66,18 @@ variable "sqs_max_receive_count" {
   default     = 3
 }
 
+variable "sqs_batch_size" {
+  description = "Maximum number of SQS messages delivered to the check processor per invocation"
+  type        = number
+  default     = 10
+}
+
+variable "sqs_batching_window_seconds" {
+  description = "Maximum time in seconds to wait while gathering an SQS batch for the check processor"
+  type        = number
+  default     = 0
+}
+
 variable "log_retention_days" {
   description = "CloudWatch logs retention in days"
   type        = number
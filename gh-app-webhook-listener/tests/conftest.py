@@ -0,0 +1,20 @@
+"""
+Pytest configuration for the local test suite.
+
+Puts src/ on sys.path once per session so the Lambda sources import the
+same way they are packaged: common.*, webhook_handler.handler and
+check_processor.handler.
+"""
+
+import importlib
+import sys
+from pathlib import Path
+
+SRC_DIR = str(Path(__file__).resolve().parent.parent / 'src')
+
+if SRC_DIR not in sys.path:
+    sys.path.insert(0, SRC_DIR)
+    importlib.invalidate_caches()
+
+# Manual script: authenticates against GitHub at import and needs real App credentials
+collect_ignore = ["test_gh_app_auth.py"]
@@ -0,0 +1,118 @@
+"""
+Sample GitHub webhook payloads for the local tests.
+
+The payload shapes are frozen, slotted dataclasses. orjson (and so
+common.json_io) serializes dataclasses natively, so a sample event can be
+turned into a request body without building dict literals first.
+"""
+
+import functools
+from dataclasses import asdict, dataclass
+from typing import Tuple
+
+
+@dataclass(frozen=True, slots=True)
+class Owner:
+    login: str
+
+
+@dataclass(frozen=True, slots=True)
+class Repository:
+    full_name: str
+    name: str
+    owner: Owner
+    default_branch: str = "main"
+
+
+@dataclass(frozen=True, slots=True)
+class Installation:
+    id: int
+
+
+@dataclass(frozen=True, slots=True)
+class PullRequestRef:
+    id: int
+    number: int
+
+
+@dataclass(frozen=True, slots=True)
+class CheckSuite:
+    id: int
+    head_sha: str
+    head_branch: str
+    pull_requests: Tuple[PullRequestRef, ...]
+
+
+@dataclass(frozen=True, slots=True)
+class Branch:
+    ref: str
+    sha: str
+
+
+@dataclass(frozen=True, slots=True)
+class PullRequest:
+    id: int
+    number: int
+    head: Branch
+    base: Branch
+
+
+@dataclass(frozen=True, slots=True)
+class CheckSuiteEvent:
+    action: str
+    check_suite: CheckSuite
+    repository: Repository
+    installation: Installation
+
+
+@dataclass(frozen=True, slots=True)
+class PullRequestEvent:
+    action: str
+    pull_request: PullRequest
+    repository: Repository
+    installation: Installation
+
+
+FOLIO = Owner("folio-org")
+TEST_REPO = Repository("folio-org/test-repo", "test-repo", FOLIO)
+APP_TEST_REPO = Repository("folio-org/app-test", "app-test", FOLIO)
+APP_ACQUISITIONS_REPO = Repository("folio-org/app-acquisitions", "app-acquisitions", FOLIO)
+INSTALLATION = Installation(67890)
+
+
+@functools.lru_cache(maxsize=None)
+def as_payload(obj) -> dict:
+    """Render a fixture object as a webhook payload dict, once per instance"""
+    return asdict(obj)
+
+
+@functools.cache
+def sample_check_suite_event() -> CheckSuiteEvent:
+    """check_suite 'requested' event for a single pull request"""
+    return CheckSuiteEvent(
+        action="requested",
+        check_suite=CheckSuite(
+            id=12345,
+            head_sha="abc123",
+            head_branch="feature-branch",
+            pull_requests=(PullRequestRef(id=1, number=42),),
+        ),
+        repository=TEST_REPO,
+        installation=INSTALLATION,
+    )
+
+
+@functools.cache
+def sample_pull_request_event() -> PullRequestEvent:
+    """pull_request 'opened' event from feature-branch into main"""
+    return PullRequestEvent(
+        action="opened",
+        pull_request=PullRequest(
+            id=54321,
+            number=123,
+            head=Branch(ref="feature-branch", sha="def456"),
+            base=Branch(ref="main", sha="base456abc"),
+        ),
+        repository=TEST_REPO,
+        installation=INSTALLATION,
+    )
@@ -4,369 +4,452 @@ Local test script for GitHub App Webhook Listener
 Tests the Lambda functions locally before deployment
 """
 
-import json
 import hmac
 import hashlib
+import base64
+import functools
+import io
+import importlib
+import importlib.util
+import logging
 import sys
 import os
 from pathlib import Path
+from unittest import mock
+
+import pytest
+from hypothesis import given, settings, strategies as st
+
+# Project paths, resolved once at import
+PROJECT_ROOT = Path(__file__).resolve().parent.parent
+SRC = PROJECT_ROOT / 'src'
+WEBHOOK_DIR = SRC / 'webhook_handler'
+CHECK_DIR = SRC / 'check_processor'
+COMMON_DIR = SRC / 'common'
+CONFIG_PATH = PROJECT_ROOT / 'config' / 'github_events_config.example.json'
+
+@functools.cache
+def _discover() -> dict:
+    """Locate the Lambda sources, once per session"""
+    return {
+        'webhook': WEBHOOK_DIR,
+        'check': CHECK_DIR,
+    }
 
-# Add src to path for imports
-project_root = Path(__file__).parent.parent
-sys.path.insert(0, str(project_root / 'src'))
+# Progress messages go through logging; show them with --log-cli-level=INFO
+log = logging.getLogger(__name__)
+
+# Under pytest, conftest.py puts src/ on sys.path; direct runs need it here
+if str(SRC) not in sys.path:
+    sys.path.insert(0, str(SRC))
+
+# The handlers create boto3 clients at import; Lambda always provides a region
+os.environ.setdefault('AWS_DEFAULT_REGION', 'us-east-1')
+
+import common.signature_validator as signature_validator
+from common.signature_validator import fast_sign, validate_github_signature, verify_cached
+import check_processor.handler as check_processor_handler
+import webhook_handler.handler as webhook_handler_module
+from common import json_io
+from common.github_client import GitHubClient
+from check_processor.handler import get_changed_files_from_push
+from fixtures import (
+    APP_ACQUISITIONS_REPO,
+    APP_TEST_REPO,
+    INSTALLATION,
+    as_payload,
+    sample_check_suite_event,
+    sample_pull_request_event,
+)
+
+# Signature fixtures, computed once at import
+TEST_SECRET = "test-secret"
+TEST_PAYLOAD = b'{"test": "payload"}'
+
+
+@functools.lru_cache(maxsize=256)
+def _sig(secret: bytes, payload: bytes) -> str:
+    """X-Hub-Signature-256 header value for a payload, computed once per (secret, payload)"""
+    return "sha256=" + hmac.digest(secret, payload, 'sha256').hex()
+
+
+TEST_SIGNATURE = _sig(TEST_SECRET.encode('utf-8'), TEST_PAYLOAD)
+
+# Sample webhook payloads, built once and shared read-only by the event tests
+CHECK_SUITE_BODY = json_io.dumps(sample_check_suite_event()).encode('utf-8')
+CHECK_SUITE_EVENT = json_io.loads(CHECK_SUITE_BODY)
+
+PULL_REQUEST_BODY = json_io.dumps(sample_pull_request_event()).encode('utf-8')
+PULL_REQUEST_EVENT = json_io.loads(PULL_REQUEST_BODY)
+
+PULL_REQUEST_MERGED_EVENT = {
+    "action": "closed",
+    "pull_request": {
+        "id": 54321,
+        "number": 123,
+        "merged": True,
+        "merge_commit_sha": "abc123def456789",
+        "head": {
+            "sha": "def456",
+            "ref": "version-update/snapshot"
+        },
+        "base": {
+            "ref": "snapshot",
+            "sha": "base789abc"
+        }
+    },
+    "repository": as_payload(APP_TEST_REPO),
+    "installation": as_payload(INSTALLATION)
+}
+
+PULL_REQUEST_CLOSED_EVENT = {
+    "action": "closed",
+    "pull_request": {
+        "id": 54322,
+        "number": 124,
+        "merged": False,
+        "merge_commit_sha": None,
+        "head": {
+            "sha": "def789",
+            "ref": "abandoned-feature"
+        },
+        "base": {
+            "ref": "main",
+            "sha": "base123abc"
+        }
+    },
+    "repository": as_payload(APP_TEST_REPO),
+    "installation": as_payload(INSTALLATION)
+}
+
+MERGE_GROUP_EVENT = {
+    "action": "checks_requested",
+    "merge_group": {
+        "head_sha": "abc123merge456",
+        "head_ref": "refs/heads/gh-readonly-queue/R1-2025/pr-42-abc123",
+        "base_sha": "base789def",
+        "base_ref": "refs/heads/R1-2025"
+    },
+    "repository": as_payload(APP_ACQUISITIONS_REPO),
+    "installation": as_payload(INSTALLATION)
+}
+
+PUSH_EVENT = {
+    "ref": "refs/heads/master",
+    "before": "abc123before",
+    "after": "def456after",
+    "commits": [
+        {
+            "id": "def456after",
+            "message": "Update config",
+            "added": [],
+            "modified": [".github/update-config.yml"],
+            "removed": []
+        }
+    ],
+    "repository": as_payload(APP_ACQUISITIONS_REPO),
+    "installation": as_payload(INSTALLATION)
+}
+
+# Headers shared by every synthetic API Gateway event
+API_GATEWAY_HEADERS = {
+    "x-github-event": None,
+    "x-github-delivery": None,
+    "x-hub-signature-256": None,
+}
+
+# Serialized bodies, built once; signatures are computed over these exact bytes
+PULL_REQUEST_MERGED_BODY = json_io.dumps(PULL_REQUEST_MERGED_EVENT).encode('utf-8')
+PULL_REQUEST_CLOSED_BODY = json_io.dumps(PULL_REQUEST_CLOSED_EVENT).encode('utf-8')
+MERGE_GROUP_BODY = json_io.dumps(MERGE_GROUP_EVENT).encode('utf-8')
+PUSH_BODY = json_io.dumps(PUSH_EVENT).encode('utf-8')
+
+def make_api_gateway_event(body: bytes, event_type: str, delivery_id: str) -> dict:
+    """Wrap a serialized webhook body the way API Gateway delivers it to the webhook handler"""
+    headers = API_GATEWAY_HEADERS.copy()
+    headers["x-github-event"] = event_type
+    headers["x-github-delivery"] = delivery_id
+    headers["x-hub-signature-256"] = _sig(TEST_SECRET.encode('utf-8'), body)
+    return {
+        "body": body.decode('utf-8'),
+        "headers": headers,
+    }
 
-from common.signature_validator import validate_github_signature
+def assert_api_gateway_event(api_gateway_event: dict, payload: dict, event_type: str, delivery_id: str):
+    """Check an API Gateway event carries the payload and the GitHub headers the webhook handler reads"""
+    body_bytes = api_gateway_event["body"].encode('utf-8')
+    assert json_io.loads(body_bytes) == payload, "Body does not round-trip to the payload"
+    assert validate_github_signature(body_bytes, api_gateway_event["headers"]["x-hub-signature-256"], TEST_SECRET), \
+        "Signature does not match the body bytes"
+    assert api_gateway_event["headers"]["x-github-event"] == event_type, "Wrong x-github-event header"
+    assert api_gateway_event["headers"]["x-github-delivery"] == delivery_id, "Wrong x-github-delivery header"
 
 def test_signature_validation():
     """Test GitHub webhook signature validation"""
-    print("Testing signature validation...")
-
-    secret = "test-secret"
-    payload = '{"test": "payload"}'
-
-    # Generate valid signature
-    signature_bytes = hmac.new(
-        secret.encode('utf-8'),
-        payload.encode('utf-8'),
-        hashlib.sha256
-    ).hexdigest()
-    signature = f"sha256={signature_bytes}"
+    log.info("Testing signature validation...")
 
     # Test valid signature
-    assert validate_github_signature(payload, signature, secret), "Valid signature failed"
-    print("[OK] Valid signature passed")
+    assert validate_github_signature(TEST_PAYLOAD, TEST_SIGNATURE, TEST_SECRET), "Valid signature failed"
+    log.info("[OK] Valid signature passed")
 
     # Test invalid signature
     invalid_signature = "sha256=invalid"
-    assert not validate_github_signature(payload, invalid_signature, secret), "Invalid signature passed"
-    print("[OK] Invalid signature rejected")
+    assert not validate_github_signature(TEST_PAYLOAD, invalid_signature, TEST_SECRET), "Invalid signature passed"
+    log.info("[OK] Invalid signature rejected")
+
+    log.info("Signature validation tests passed!")
+
+@pytest.mark.parametrize("payload, signed_payload, secret, expected", [
+    (TEST_PAYLOAD, TEST_PAYLOAD, TEST_SECRET, True),
+    (b'', b'', TEST_SECRET, True),
+    (b'{"action": "opened"}', b'{"action": "opened"}', TEST_SECRET, True),
+    (TEST_PAYLOAD, b'{"test": "other"}', TEST_SECRET, False),
+    (TEST_PAYLOAD, TEST_PAYLOAD, "other-secret", False),
+])
+def test_signature_validation_cases(payload, signed_payload, secret, expected):
+    """Test signature validation across payload/secret combinations"""
+    signature = _sig(TEST_SECRET.encode('utf-8'), signed_payload)
+    assert validate_github_signature(payload, signature, secret) is expected
+
+@settings(max_examples=200, deadline=50)
+@given(payload=st.binary(), secret=st.text(min_size=1))
+def test_signature_validation_property(payload, secret):
+    """Property: a correct signature validates, an all-zero or sha1= one does not"""
+    expected = hmac.digest(secret.encode('utf-8'), payload, 'sha256').hex()
+
+    assert validate_github_signature(payload, f"sha256={expected}", secret) is True
+    assert validate_github_signature(payload, "sha256=" + "0" * 64, secret) is False
+    assert validate_github_signature(payload, f"sha1={expected}", secret) is False
+
+def test_fast_sign():
+    """Test that the pre-keyed signer matches a from-scratch HMAC-SHA256"""
+    for payload in (TEST_PAYLOAD, b'', b'x' * 4096):
+        expected = hmac.digest(TEST_SECRET.encode('utf-8'), payload, 'sha256')
+        assert hmac.compare_digest(fast_sign(payload, TEST_SECRET), expected), f"Digest mismatch for {len(payload)}-byte payload"
+    assert "sha256=" + fast_sign(TEST_PAYLOAD, TEST_SECRET).hex() == TEST_SIGNATURE
+    log.info("[OK] fast_sign matches hmac.digest")
+
+def _flip_hex_digit(signature: str, index: int) -> str:
+    """Change a single hex digit of a sha256= signature"""
+    digit = signature[index]
+    return signature[:index] + format(int(digit, 16) ^ 0x1, 'x') + signature[index + 1:]
+
+@pytest.mark.parametrize("tampered_signature", [
+    _flip_hex_digit(TEST_SIGNATURE, len("sha256=")),
+    _flip_hex_digit(TEST_SIGNATURE, len("sha256=") + 32),
+    _flip_hex_digit(TEST_SIGNATURE, len(TEST_SIGNATURE) - 1),
+    TEST_SIGNATURE[:-2],
+    TEST_SIGNATURE[:-1],
+    TEST_SIGNATURE + "00",
+], ids=["first-nibble", "middle-nibble", "last-nibble", "truncated-byte", "odd-length", "extended"])
+def test_signature_validation_rejects_near_misses(tampered_signature):
+    """Test that signatures differing in one nibble or in length are rejected"""
+    assert not validate_github_signature(TEST_PAYLOAD, tampered_signature, TEST_SECRET)
+
+def test_signature_validation_constant_time():
+    """Test that signatures are compared with hmac.compare_digest"""
+    log.info("Testing constant-time signature comparison...")
+
+    with mock.patch.object(hmac, "compare_digest", wraps=hmac.compare_digest) as compare_digest:
+        assert validate_github_signature(TEST_PAYLOAD, TEST_SIGNATURE, TEST_SECRET), "Valid signature failed"
+
+    compare_digest.assert_called_once()
+    (expected, provided), _ = compare_digest.call_args
+    assert type(expected) is bytes and type(provided) is bytes, "Digests not compared as bytes"
+    assert len(expected) == len(provided) == hashlib.sha256().digest_size, "Digests differ in length"
+    log.info("[OK] Raw digests compared with hmac.compare_digest")
+
+def test_signature_validation_retry_cached():
+    """Test that a redelivered webhook is not re-validated"""
+    log.info("Testing redelivery verification cache...")
+
+    delivery_id = "retry-12345"
+    signature_validator._clear_verified_cache()
+
+    with mock.patch.object(signature_validator, "validate_github_signature",
+                           wraps=validate_github_signature) as validate:
+        assert verify_cached(TEST_PAYLOAD, TEST_SIGNATURE, TEST_SECRET, delivery_id), "First delivery failed"
+        assert verify_cached(TEST_PAYLOAD, TEST_SIGNATURE, TEST_SECRET, delivery_id), "Redelivery failed"
+        validate.assert_called_once()
+        log.info("[OK] Redelivery served from cache")
+
+        # Same delivery ID and signature with a different body must not hit the cache
+        assert not verify_cached(TEST_PAYLOAD + b"x", TEST_SIGNATURE, TEST_SECRET, delivery_id), "Tampered body passed"
+        assert validate.call_count == 2
+        log.info("[OK] Tampered redelivery rejected")
+
+def _verify_deliveries(count: int, size: int) -> list:
+    """Verify `count` distinct signed deliveries of `size`-byte bodies through the cache"""
+    payloads = [bytes([i]) * size for i in range(count)]
+    for i, payload in enumerate(payloads):
+        signature = _sig(TEST_SECRET.encode('utf-8'), payload)
+        assert verify_cached(payload, signature, TEST_SECRET, f"delivery-{i}")
+    return payloads
+
+def test_verified_cache_evicts_expired_entries():
+    """Test that expired deliveries are dropped on the next insert"""
+    signature_validator._clear_verified_cache()
+
+    # Each delivery arrives after the previous one's TTL has run out
+    clock = mock.Mock()
+    clock.monotonic.side_effect = [0.0, 100.0, 200.0]
+    with mock.patch.object(signature_validator, "time", clock):
+        payloads = _verify_deliveries(3, 16)
+
+    assert [key[0] for key in signature_validator._verified] == ["delivery-2"]
+    assert signature_validator._verified_bytes == len(payloads[-1])
+
+def test_verified_cache_memory_limit():
+    """Test that the cache never holds more body bytes than its limit, nor oversized bodies"""
+    signature_validator._clear_verified_cache()
+
+    with mock.patch.object(signature_validator, "VERIFIED_CACHE_MAX_BYTES", 2500):
+        _verify_deliveries(5, 1000)
+        assert [key[0] for key in signature_validator._verified] == ["delivery-3", "delivery-4"]
+        assert signature_validator._verified_bytes == 2000
+
+    signature_validator._clear_verified_cache()
+    with mock.patch.object(signature_validator, "VERIFIED_CACHE_MAX_BODY_BYTES", 100):
+        _verify_deliveries(1, 101)
+    assert not signature_validator._verified, "Oversized body was cached"
+    assert signature_validator._verified_bytes == 0
+
+def _cpu_sha_flags() -> set:
+    """SHA extension flags advertised in /proc/cpuinfo (sha_ni on x86, sha2 on ARMv8)"""
+    try:
+        with open("/proc/cpuinfo") as f:
+            flags = {word for line in f if line.startswith(("flags", "Features")) for word in line.split()}
+    except OSError:
+        return set()
+    return flags & {"sha_ni", "sha2"}
+
+def test_signature_hmac_uses_openssl():
+    """Test that HMAC-SHA256 runs on OpenSSL rather than a pure-Python fallback"""
+    log.info("Testing OpenSSL-backed SHA-256...")
 
-    print("Signature validation tests passed!\n")
+    import _hashlib
+    import ssl
+
+    assert 'sha256' in hashlib.algorithms_available, "sha256 not available"
+    assert hashlib.sha256 is _hashlib.openssl_sha256, "hashlib.sha256 is not OpenSSL-backed"
+    log.info("[OK] hashlib.sha256 is provided by OpenSSL")
+
+    # OpenSSL selects SHA-NI / ARMv8 SHA2 code paths at runtime; report what this host offers
+    cpu_flags = _cpu_sha_flags()
+    log.info(f"  - {ssl.OPENSSL_VERSION}")
+    log.info(f"  - CPU SHA extensions: {', '.join(sorted(cpu_flags)) if cpu_flags else 'none advertised'}")
 
 def test_check_suite_event():
     """Test check_suite event structure"""
-    print("Testing check_suite event processing...")
-
-    # Sample check_suite event
-    event = {
-        "action": "requested",
-        "check_suite": {
-            "id": 12345,
-            "head_sha": "abc123",
-            "head_branch": "feature-branch",
-            "pull_requests": [
-                {
-                    "id": 1,
-                    "number": 42
-                }
-            ]
-        },
-        "repository": {
-            "full_name": "folio-org/test-repo",
-            "name": "test-repo",
-            "owner": {
-                "login": "folio-org"
-            },
-            "default_branch": "main"
-        },
-        "installation": {
-            "id": 67890
-        }
-    }
+    log.info("Testing check_suite event processing...")
 
-    # Create API Gateway event
-    api_gateway_event = {
-        "body": json.dumps(event),
-        "headers": {
-            "x-github-event": "check_suite",
-            "x-github-delivery": "12345-67890",
-            "x-hub-signature-256": "sha256=test"
-        }
-    }
+    api_gateway_event = make_api_gateway_event(CHECK_SUITE_BODY, "check_suite", "12345-67890")
 
-    print(f"[OK] Created test event for repository: {event['repository']['full_name']}")
-    print(f"[OK] Check suite ID: {event['check_suite']['id']}")
-    print(f"[OK] PR number: {event['check_suite']['pull_requests'][0]['number']}")
+    log.info(f"[OK] Created test event for repository: {CHECK_SUITE_EVENT['repository']['full_name']}")
+    log.info(f"[OK] Check suite ID: {CHECK_SUITE_EVENT['check_suite']['id']}")
+    log.info(f"[OK] PR number: {CHECK_SUITE_EVENT['check_suite']['pull_requests'][0]['number']}")
 
-    return api_gateway_event
+    assert_api_gateway_event(api_gateway_event, CHECK_SUITE_EVENT, "check_suite", "12345-67890")
 
 def test_pull_request_event():
     """Test pull_request event structure"""
-    print("Testing pull_request event processing...")
-
-    # Sample pull_request event
-    event = {
-        "action": "opened",
-        "pull_request": {
-            "id": 54321,
-            "number": 123,
-            "head": {
-                "sha": "def456",
-                "ref": "feature-branch"
-            },
-            "base": {
-                "ref": "main"
-            }
-        },
-        "repository": {
-            "full_name": "folio-org/test-repo",
-            "name": "test-repo",
-            "owner": {
-                "login": "folio-org"
-            }
-        },
-        "installation": {
-            "id": 67890
-        }
-    }
+    log.info("Testing pull_request event processing...")
 
-    # Create API Gateway event
-    api_gateway_event = {
-        "body": json.dumps(event),
-        "headers": {
-            "x-github-event": "pull_request",
-            "x-github-delivery": "54321-09876",
-            "x-hub-signature-256": "sha256=test"
-        }
-    }
+    api_gateway_event = make_api_gateway_event(PULL_REQUEST_BODY, "pull_request", "54321-09876")
 
-    print(f"[OK] Created PR event for repository: {event['repository']['full_name']}")
-    print(f"[OK] PR number: {event['pull_request']['number']}")
-    print(f"[OK] PR action: {event['action']}")
+    log.info(f"[OK] Created PR event for repository: {PULL_REQUEST_EVENT['repository']['full_name']}")
+    log.info(f"[OK] PR number: {PULL_REQUEST_EVENT['pull_request']['number']}")
+    log.info(f"[OK] PR action: {PULL_REQUEST_EVENT['action']}")
 
-    return api_gateway_event
+    assert_api_gateway_event(api_gateway_event, PULL_REQUEST_EVENT, "pull_request", "54321-09876")
 
 def test_pull_request_closed_merged_event():
     """Test pull_request closed (merged) event structure"""
-    print("Testing pull_request closed (merged) event processing...")
-
-    event = {
-        "action": "closed",
-        "pull_request": {
-            "id": 54321,
-            "number": 123,
-            "merged": True,
-            "merge_commit_sha": "abc123def456789",
-            "head": {
-                "sha": "def456",
-                "ref": "version-update/snapshot"
-            },
-            "base": {
-                "ref": "snapshot",
-                "sha": "base789abc"
-            }
-        },
-        "repository": {
-            "full_name": "folio-org/app-test",
-            "name": "app-test",
-            "owner": {
-                "login": "folio-org"
-            }
-        },
-        "installation": {
-            "id": 67890
-        }
-    }
+    log.info("Testing pull_request closed (merged) event processing...")
 
-    api_gateway_event = {
-        "body": json.dumps(event),
-        "headers": {
-            "x-github-event": "pull_request",
-            "x-github-delivery": "merged-12345-67890",
-            "x-hub-signature-256": "sha256=test"
-        }
-    }
+    api_gateway_event = make_api_gateway_event(PULL_REQUEST_MERGED_BODY, "pull_request", "merged-12345-67890")
 
-    print(f"[OK] Created merged PR event for repository: {event['repository']['full_name']}")
-    print(f"[OK] PR number: {event['pull_request']['number']}")
-    print(f"[OK] PR merged: {event['pull_request']['merged']}")
-    print(f"[OK] Base branch: {event['pull_request']['base']['ref']}")
+    log.info(f"[OK] Created merged PR event for repository: {PULL_REQUEST_MERGED_EVENT['repository']['full_name']}")
+    log.info(f"[OK] PR number: {PULL_REQUEST_MERGED_EVENT['pull_request']['number']}")
+    log.info(f"[OK] PR merged: {PULL_REQUEST_MERGED_EVENT['pull_request']['merged']}")
+    log.info(f"[OK] Base branch: {PULL_REQUEST_MERGED_EVENT['pull_request']['base']['ref']}")
 
-    return api_gateway_event
+    assert_api_gateway_event(api_gateway_event, PULL_REQUEST_MERGED_EVENT, "pull_request", "merged-12345-67890")
 
 def test_pull_request_closed_not_merged_event():
     """Test pull_request closed (not merged) event structure"""
-    print("Testing pull_request closed (not merged) event processing...")
-
-    event = {
-        "action": "closed",
-        "pull_request": {
-            "id": 54322,
-            "number": 124,
-            "merged": False,
-            "merge_commit_sha": None,
-            "head": {
-                "sha": "def789",
-                "ref": "abandoned-feature"
-            },
-            "base": {
-                "ref": "main",
-                "sha": "base123abc"
-            }
-        },
-        "repository": {
-            "full_name": "folio-org/app-test",
-            "name": "app-test",
-            "owner": {
-                "login": "folio-org"
-            }
-        },
-        "installation": {
-            "id": 67890
-        }
-    }
+    log.info("Testing pull_request closed (not merged) event processing...")
 
-    api_gateway_event = {
-        "body": json.dumps(event),
-        "headers": {
-            "x-github-event": "pull_request",
-            "x-github-delivery": "closed-12345-67890",
-            "x-hub-signature-256": "sha256=test"
-        }
-    }
+    api_gateway_event = make_api_gateway_event(PULL_REQUEST_CLOSED_BODY, "pull_request", "closed-12345-67890")
 
-    print(f"[OK] Created closed (not merged) PR event for repository: {event['repository']['full_name']}")
-    print(f"[OK] PR number: {event['pull_request']['number']}")
-    print(f"[OK] PR merged: {event['pull_request']['merged']}")
+    log.info(f"[OK] Created closed (not merged) PR event for repository: {PULL_REQUEST_CLOSED_EVENT['repository']['full_name']}")
+    log.info(f"[OK] PR number: {PULL_REQUEST_CLOSED_EVENT['pull_request']['number']}")
+    log.info(f"[OK] PR merged: {PULL_REQUEST_CLOSED_EVENT['pull_request']['merged']}")
 
-    return api_gateway_event
+    assert_api_gateway_event(api_gateway_event, PULL_REQUEST_CLOSED_EVENT, "pull_request", "closed-12345-67890")
 
 def test_merge_group_checks_requested_event():
     """Test merge_group checks_requested event structure"""
-    print("Testing merge_group checks_requested event processing...")
-
-    event = {
-        "action": "checks_requested",
-        "merge_group": {
-            "head_sha": "abc123merge456",
-            "head_ref": "refs/heads/gh-readonly-queue/R1-2025/pr-42-abc123",
-            "base_sha": "base789def",
-            "base_ref": "refs/heads/R1-2025"
-        },
-        "repository": {
-            "full_name": "folio-org/app-acquisitions",
-            "name": "app-acquisitions",
-            "owner": {
-                "login": "folio-org"
-            }
-        },
-        "installation": {
-            "id": 67890
-        }
-    }
+    log.info("Testing merge_group checks_requested event processing...")
 
-    api_gateway_event = {
-        "body": json.dumps(event),
-        "headers": {
-            "x-github-event": "merge_group",
-            "x-github-delivery": "merge-group-12345-67890",
-            "x-hub-signature-256": "sha256=test"
-        }
-    }
+    api_gateway_event = make_api_gateway_event(MERGE_GROUP_BODY, "merge_group", "merge-group-12345-67890")
 
-    print(f"[OK] Created merge_group event for repository: {event['repository']['full_name']}")
-    print(f"[OK] Action: {event['action']}")
-    print(f"[OK] Head SHA (synthetic merge commit): {event['merge_group']['head_sha']}")
-    print(f"[OK] Base ref: {event['merge_group']['base_ref']}")
+    log.info(f"[OK] Created merge_group event for repository: {MERGE_GROUP_EVENT['repository']['full_name']}")
+    log.info(f"[OK] Action: {MERGE_GROUP_EVENT['action']}")
+    log.info(f"[OK] Head SHA (synthetic merge commit): {MERGE_GROUP_EVENT['merge_group']['head_sha']}")
+    log.info(f"[OK] Base ref: {MERGE_GROUP_EVENT['merge_group']['base_ref']}")
 
-    return api_gateway_event
+    assert_api_gateway_event(api_gateway_event, MERGE_GROUP_EVENT, "merge_group", "merge-group-12345-67890")
 
 
 def test_merge_group_template_variables():
     """Test merge_group template variable extraction"""
-    print("Testing merge_group template variable extraction...")
-
-    merge_group_payload = {
-        "head_sha": "synthetic123merge456",
-        "head_ref": "refs/heads/gh-readonly-queue/R1-2025/pr-42-abc123",
-        "base_sha": "base789def",
-        "base_ref": "refs/heads/R1-2025"
-    }
+    log.info("Testing merge_group template variable extraction...")
 
-    head_branch = merge_group_payload.get('head_ref', '').replace('refs/heads/', '')
-    base_branch = merge_group_payload.get('base_ref', '').replace('refs/heads/', '')
-    head_sha = merge_group_payload.get('head_sha', '')
-    base_sha = merge_group_payload.get('base_sha', '')
-
-    assert head_branch == "gh-readonly-queue/R1-2025/pr-42-abc123", f"Expected head_branch to be 'gh-readonly-queue/R1-2025/pr-42-abc123', got '{head_branch}'"
-    print(f"[OK] head_branch extracted correctly: {head_branch}")
+    ev = check_processor_handler.normalize_event({
+        "event_type": "merge_group",
+        "action": "checks_requested",
+        "payload": MERGE_GROUP_EVENT,
+    })
 
-    assert base_branch == "R1-2025", f"Expected base_branch to be 'R1-2025', got '{base_branch}'"
-    print(f"[OK] base_branch extracted correctly (refs/heads/ stripped): {base_branch}")
+    assert ev.head_branch == "gh-readonly-queue/R1-2025/pr-42-abc123", f"Expected head_branch to be 'gh-readonly-queue/R1-2025/pr-42-abc123', got '{ev.head_branch}'"
+    log.info(f"[OK] head_branch extracted correctly: {ev.head_branch}")
 
-    assert head_sha == "synthetic123merge456", f"Expected head_sha to be 'synthetic123merge456', got '{head_sha}'"
-    print(f"[OK] head_sha extracted correctly: {head_sha}")
+    assert ev.base_branch == "R1-2025", f"Expected base_branch to be 'R1-2025', got '{ev.base_branch}'"
+    log.info(f"[OK] base_branch extracted correctly (refs/heads/ stripped): {ev.base_branch}")
 
-    assert base_sha == "base789def", f"Expected base_sha to be 'base789def', got '{base_sha}'"
-    print(f"[OK] base_sha extracted correctly: {base_sha}")
+    assert ev.head_sha == "abc123merge456", f"Expected head_sha to be 'abc123merge456', got '{ev.head_sha}'"
+    log.info(f"[OK] head_sha extracted correctly: {ev.head_sha}")
 
-    is_merge_group = True
-    pr_number = ''
+    assert ev.base_sha == "base789def", f"Expected base_sha to be 'base789def', got '{ev.base_sha}'"
+    log.info(f"[OK] base_sha extracted correctly: {ev.base_sha}")
 
-    assert pr_number == '', f"Expected pr_number to be empty for merge_group, got '{pr_number}'"
-    print(f"[OK] pr_number is empty (merge_group can have multiple PRs): '{pr_number}'")
+    assert ev.pr_number == '', f"Expected pr_number to be empty for merge_group, got '{ev.pr_number}'"
+    log.info(f"[OK] pr_number is empty (merge_group can have multiple PRs): '{ev.pr_number}'")
 
-    assert is_merge_group == True, f"Expected is_merge_group to be True"
-    print(f"[OK] is_merge_group flag set correctly: {is_merge_group}")
+    assert ev.is_merge_group == "true", f"Expected is_merge_group to be 'true', got '{ev.is_merge_group}'"
+    log.info(f"[OK] is_merge_group flag set correctly: {ev.is_merge_group}")
 
-    print("All merge_group template variable extractions passed!\n")
+    log.info("All merge_group template variable extractions passed!")
 
 
 def test_push_event_with_file_changes():
     """Test push event structure with file changes"""
-    print("Testing push event with file changes...")
-
-    event = {
-        "ref": "refs/heads/master",
-        "before": "abc123before",
-        "after": "def456after",
-        "commits": [
-            {
-                "id": "def456after",
-                "message": "Update config",
-                "added": [],
-                "modified": [".github/update-config.yml"],
-                "removed": []
-            }
-        ],
-        "repository": {
-            "full_name": "folio-org/app-acquisitions",
-            "name": "app-acquisitions",
-            "owner": {
-                "login": "folio-org"
-            }
-        },
-        "installation": {
-            "id": 67890
-        }
-    }
+    log.info("Testing push event with file changes...")
 
-    api_gateway_event = {
-        "body": json.dumps(event),
-        "headers": {
-            "x-github-event": "push",
-            "x-github-delivery": "push-12345-67890",
-            "x-hub-signature-256": "sha256=test"
-        }
-    }
+    api_gateway_event = make_api_gateway_event(PUSH_BODY, "push", "push-12345-67890")
 
-    print(f"[OK] Created push event for repository: {event['repository']['full_name']}")
-    print(f"[OK] Ref: {event['ref']}")
-    print(f"[OK] Head SHA (after): {event['after']}")
-    print(f"[OK] Modified files: {event['commits'][0]['modified']}")
+    log.info(f"[OK] Created push event for repository: {PUSH_EVENT['repository']['full_name']}")
+    log.info(f"[OK] Ref: {PUSH_EVENT['ref']}")
+    log.info(f"[OK] Head SHA (after): {PUSH_EVENT['after']}")
+    log.info(f"[OK] Modified files: {PUSH_EVENT['commits'][0]['modified']}")
 
-    return api_gateway_event
+    assert_api_gateway_event(api_gateway_event, PUSH_EVENT, "push", "push-12345-67890")
 
 
 def test_push_event_changed_files_extraction():
     """Test extraction of changed files from push event"""
-    print("Testing push event changed files extraction...")
-
-    # Import the function we're testing
-    import sys
-    sys.path.insert(0, str(project_root / 'src' / 'check_processor'))
-    from handler import get_changed_files_from_push
-    sys.path.remove(str(project_root / 'src' / 'check_processor'))
+    log.info("Testing push event changed files extraction...")
 
     payload = {
         "commits": [
@@ -389,165 +472,348 @@ def test_push_event_changed_files_extraction():
     actual_files = set(changed_files)
 
     assert actual_files == expected_files, f"Expected {expected_files}, got {actual_files}"
-    print(f"[OK] Extracted changed files correctly: {changed_files}")
-
-    print("Push event changed files extraction test passed!\n")
-
+    log.info(f"[OK] Extracted changed files correctly: {changed_files}")
 
-def test_workflow_config():
-    """Test workflow configuration loading"""
-    print("Testing workflow configuration...")
-
-    config_path = project_root / "config" / "workflows.json"
-    if config_path.exists():
-        with open(config_path, 'r') as f:
-            config = json.load(f)
-
-        print(f"[OK] Config loaded successfully")
-        if "workflows" in config:
-            print(f"  - Found {len(config['workflows'])} workflow configurations")
-        else:
-            print("  - No workflows configured")
-    else:
-        print("[WARNING] Config file not found at", config_path)
-
-    print()
-
-def test_imports():
-    """Test that all modules can be imported"""
-    print("Testing module imports...")
+    log.info("Push event changed files extraction test passed!")
 
-    success = True
+@pytest.mark.parametrize("file_count", [10, 1000, 50000])
+def test_push_event_changed_files_extraction_large(file_count):
+    """Test changed files extraction on large pushes with overlapping commits"""
+    log.info(f"Testing changed files extraction with {file_count} files...")
 
-    # Test webhook_handler imports
-    try:
-        # Add webhook_handler to path temporarily
-        sys.path.insert(0, str(project_root / 'src' / 'webhook_handler'))
-        from handler import handler as webhook_handler
-        print("[OK] webhook_handler.handler imported")
-    except ImportError as e:
-        print(f"[FAIL] webhook_handler import failed: {e}")
-        success = False
-    finally:
-        # Remove from path
-        if str(project_root / 'src' / 'webhook_handler') in sys.path:
-            sys.path.remove(str(project_root / 'src' / 'webhook_handler'))
-
-    # Test check_processor imports
-    try:
-        # Add check_processor to path temporarily
-        sys.path.insert(0, str(project_root / 'src' / 'check_processor'))
-        from handler import handler as check_processor
-        print("[OK] check_processor.handler imported")
-    except ImportError as e:
-        print(f"[FAIL] check_processor import failed: {e}")
-        success = False
-    finally:
-        # Remove from path
-        if str(project_root / 'src' / 'check_processor') in sys.path:
-            sys.path.remove(str(project_root / 'src' / 'check_processor'))
-
-    # Test common module imports
-    try:
-        from common.signature_validator import validate_github_signature
-        print("[OK] signature_validator imported")
+    files = [f"src/module_{i}.py" for i in range(file_count)]
+    # Consecutive commits overlap by half, so every file is reported twice
+    step = max(file_count // 2, 1)
+    payload = {
+        "commits": [
+            {
+                "added": files[start:start + step],
+                "modified": files[start + step:start + 2 * step],
+                "removed": []
+            }
+            for start in range(0, file_count, step)
+        ]
+    }
 
-        from common.github_client import GitHubClient
-        print("[OK] GitHubClient imported")
+    changed_files = get_changed_files_from_push(payload)
 
-        from common.check_runner import CheckRunner
-        print("[OK] CheckRunner imported")
-    except ImportError as e:
-        print(f"[FAIL] Common module import failed: {e}")
-        success = False
+    assert len(changed_files) == file_count, f"Expected {file_count} unique files, got {len(changed_files)}"
+    assert set(changed_files) == set(files)
+    log.info(f"[OK] Extracted {file_count} unique files")
+
+def test_webhook_handler_enqueues_signed_event(monkeypatch):
+    """Test the webhook Lambda end to end: signature check, SQS message shape and error responses"""
+    log.info("Testing webhook handler...")
+
+    secretsmanager = mock.Mock()
+    secretsmanager.get_secret_value.return_value = {"SecretString": TEST_SECRET}
+    sqs = mock.Mock()
+    monkeypatch.setattr(webhook_handler_module, "_secretsmanager", secretsmanager)
+    monkeypatch.setattr(webhook_handler_module, "_sqs", sqs)
+    monkeypatch.setattr(webhook_handler_module, "_secret_cache", None)
+    monkeypatch.setattr(webhook_handler_module, "_secret_cache_expires", 0.0)
+    monkeypatch.setenv("WEBHOOK_SECRET_ARN", "arn:aws:secretsmanager:us-east-1:000000000000:secret:webhook")
+    signature_validator._clear_verified_cache()
+
+    # Plain body: the raw bytes are spliced into the SQS message
+    api_gateway_event = make_api_gateway_event(PULL_REQUEST_BODY, "pull_request", "handler-12345")
+    response = webhook_handler_module.handler(api_gateway_event, None)
+
+    assert response["statusCode"] == 200, response
+    assert json_io.loads(response["body"])["delivery_id"] == "handler-12345"
+    sqs.send_message.assert_called_once()
+    message = json_io.loads(sqs.send_message.call_args.kwargs["MessageBody"])
+    assert message["payload"] == PULL_REQUEST_EVENT, "Payload not carried through unchanged"
+
+    ev = check_processor_handler.normalize_event(message)
+    assert (ev.event_type, ev.action, ev.delivery_id) == ("pull_request", "opened", "handler-12345")
+    assert (ev.repo.owner, ev.repo.name) == ("folio-org", "test-repo")
+    assert ev.head_branch == "feature-branch" and ev.pr_number == "123"
+    log.info("[OK] SQS message parsed by check_processor.normalize_event")
+
+    # Base64-encoded body: the signature is checked against the decoded bytes
+    api_gateway_event = make_api_gateway_event(CHECK_SUITE_BODY, "check_suite", "handler-67890")
+    api_gateway_event["body"] = base64.b64encode(CHECK_SUITE_BODY).decode('ascii')
+    api_gateway_event["isBase64Encoded"] = True
+    response = webhook_handler_module.handler(api_gateway_event, None)
+
+    assert response["statusCode"] == 200, response
+    message = json_io.loads(sqs.send_message.call_args.kwargs["MessageBody"])
+    ev = check_processor_handler.normalize_event(message)
+    assert (ev.event_type, ev.action, ev.check_suite_id) == ("check_suite", "requested", "12345")
+    log.info("[OK] Base64-encoded body accepted")
+
+    # The secret is fetched once and reused across invocations
+    secretsmanager.get_secret_value.assert_called_once()
+    log.info("[OK] Webhook secret cached across calls")
+
+    # Error responses; none of them reach SQS
+    sqs.send_message.reset_mock()
+
+    unsigned = make_api_gateway_event(PULL_REQUEST_BODY, "pull_request", "handler-unsigned")
+    del unsigned["headers"]["x-hub-signature-256"]
+    assert webhook_handler_module.handler(unsigned, None)["statusCode"] == 401
+
+    forged = make_api_gateway_event(PULL_REQUEST_BODY, "pull_request", "handler-forged")
+    forged["headers"]["x-hub-signature-256"] = "sha256=" + "0" * 64
+    assert webhook_handler_module.handler(forged, None)["statusCode"] == 401
+
+    not_json = make_api_gateway_event(b"not json", "pull_request", "handler-not-json")
+    assert webhook_handler_module.handler(not_json, None)["statusCode"] == 400
+
+    sqs.send_message.assert_not_called()
+    log.info("[OK] 401/400 responses returned without queuing")
+
+def _github_response(status_code: int, body: dict = None) -> mock.Mock:
+    """Minimal stand-in for a requests.Response"""
+    response = mock.Mock(status_code=status_code, text=json_io.dumps(body) if body else "")
+    response.json.return_value = body
+    return response
+
+def test_github_client_refreshes_rejected_token():
+    """Test that a 401 drops the cached installation token and the request is retried once"""
+    with mock.patch.object(GitHubClient, "_get_private_key", return_value="private-key"):
+        client = GitHubClient()
+    client._create_jwt = mock.Mock(return_value="app-jwt")
+    client._session = mock.Mock()
+    client._session.post.return_value = _github_response(201, {"token": "fresh-token", "expires_at": "2099-01-01T00:00:00Z"})
+    client._session.request.side_effect = [_github_response(401), _github_response(200, {"ok": True})]
+
+    # A cached token that GitHub has since revoked
+    client._token = "revoked-token"
+    client._token_expires_at = float("inf")
+
+    assert client.make_request("GET", "repos/folio-org/test-repo") == {"ok": True}
+
+    client._session.post.assert_called_once()
+    sent_tokens = [call.kwargs["headers"]["Authorization"] for call in client._session.request.call_args_list]
+    assert sent_tokens == ["token revoked-token", "token fresh-token"]
+    assert client._token == "fresh-token"
+    log.info("[OK] Revoked installation token refreshed and request retried")
+
+def test_private_key_refreshed_after_ttl(monkeypatch):
+    """Test that the cached GitHub client is kept and only its App private key is re-read after the TTL"""
+    monkeypatch.setattr(check_processor_handler, "_workflow_trigger", None)
+    monkeypatch.setattr(check_processor_handler, "_workflow_trigger_expires", 0.0)
+
+    with mock.patch.object(check_processor_handler, "GitHubClient") as github_client:
+        first = check_processor_handler._get_workflow_trigger()
+        assert check_processor_handler._get_workflow_trigger() is first, "Trigger not reused within the TTL"
+        github_client.return_value.refresh_private_key.assert_not_called()
+
+        # Simulate the TTL elapsing
+        monkeypatch.setattr(check_processor_handler, "_workflow_trigger_expires", 0.0)
+        assert check_processor_handler._get_workflow_trigger() is first, "Trigger rebuilt after the TTL"
+        github_client.assert_called_once()
+        github_client.return_value.refresh_private_key.assert_called_once()
+    log.info("[OK] GitHub App private key refreshed after CACHE_PRIVATE_KEY_TTL")
+
+_S3_CONFIG = {
+    "event_mappings": [
+        {"event_type": "pull_request", "actions": ["opened", "synchronize"], "repository_patterns": []}
+    ]
+}
+
+def _mock_s3(monkeypatch) -> mock.Mock:
+    """Replace check_processor's S3 client with one serving _S3_CONFIG, and empty the config cache"""
+    s3 = mock.Mock()
+    s3.get_object.side_effect = lambda **kwargs: {"Body": io.BytesIO(json_io.dumps(_S3_CONFIG).encode('utf-8'))}
+    monkeypatch.setattr(check_processor_handler, "_s3", s3)
+    monkeypatch.setattr(check_processor_handler, "_config_cache", {})
+    return s3
+
+def test_config_loaded_once_within_ttl(monkeypatch):
+    """Test that the S3 config is cached per (bucket, key) and actions are frozen at load time"""
+    s3 = _mock_s3(monkeypatch)
+    monkeypatch.setattr(check_processor_handler, "_CONFIG_CACHE_TTL", 300.0)
+
+    config = check_processor_handler.load_config_from_s3("config-bucket", "github_events_config.json")
+    again = check_processor_handler.load_config_from_s3("config-bucket", "github_events_config.json")
+
+    assert again is config
+    s3.get_object.assert_called_once_with(Bucket="config-bucket", Key="github_events_config.json")
+    assert config["event_mappings"][0]["actions"] == frozenset({"opened", "synchronize"})
+    assert isinstance(config["event_mappings"][0]["actions"], frozenset)
+    log.info("[OK] Config served from cache within CACHE_CONFIG_TTL")
+
+def test_config_reloaded_without_cache(monkeypatch):
+    """Test that CACHE_CONFIG_TTL=0 reloads the config from S3 on every call"""
+    s3 = _mock_s3(monkeypatch)
+    monkeypatch.setattr(check_processor_handler, "_CONFIG_CACHE_TTL", 0.0)
+
+    check_processor_handler.load_config_from_s3("config-bucket", "github_events_config.json")
+    check_processor_handler.load_config_from_s3("config-bucket", "github_events_config.json")
+
+    assert s3.get_object.call_count == 2
+    log.info("[OK] Config reloaded with CACHE_CONFIG_TTL=0")
+
+# check_processor config dispatching ci.yml for every opened folio-org pull request
+BATCH_CONFIG = {
+    "event_mappings": [
+        {
+            "event_type": "pull_request",
+            "actions": ["opened"],
+            "repository_patterns": [
+                {
+                    "owner": "folio-org",
+                    "repository": "*",
+                    "branches": "*",
+                    "workflows": [
+                        {
+                            "owner": "folio-org",
+                            "repository": "{repository}",
+                            "workflow_file": "ci.yml",
+                            "ref": "{head_branch}",
+                            "inputs": {"pr_number": "{pr_number}"}
+                        }
+                    ]
+                }
+            ]
+        }
+    ]
+}
+
+def _sqs_record(i: int) -> dict:
+    """SQS record carrying the queued pull_request event, as the webhook handler enqueues it"""
+    return {
+        "messageId": f"message-{i}",
+        "body": json_io.dumps({
+            "event_type": "pull_request",
+            "action": "opened",
+            "delivery_id": f"batch-{i}",
+            "payload": PULL_REQUEST_EVENT,
+        }),
+    }
 
-    if success:
-        print("All imports successful!\n")
+def test_batch_event_processing():
+    """Test that one SQS batch of webhook events shares a single GitHub client"""
+    log.info("Testing batched event processing...")
+
+    event = {"Records": [_sqs_record(i) for i in range(10)]}
+
+    with mock.patch.object(check_processor_handler, "_workflow_trigger", None), \
+            mock.patch.object(check_processor_handler, "load_config_from_s3", return_value=BATCH_CONFIG), \
+            mock.patch.object(check_processor_handler, "GitHubClient") as github_client, \
+            mock.patch.object(check_processor_handler, "WorkflowTrigger") as workflow_trigger:
+        result = check_processor_handler.handler(event, None)
+
+    assert result["statusCode"] == 200
+    assert json_io.loads(result["body"]) == {"processed": 10, "errors": 0}
+    assert "batchItemFailures" not in result
+    github_client.assert_called_once_with()
+    workflow_trigger.assert_called_once_with(github_client.return_value)
+    trigger_workflow = workflow_trigger.return_value.trigger_workflow
+    assert trigger_workflow.call_count == 10
+    trigger_workflow.assert_called_with(
+        owner="folio-org",
+        repo="test-repo",
+        workflow_file="ci.yml",
+        ref="feature-branch",
+        inputs={"pr_number": "123"},
+    )
+    log.info("[OK] 10 events dispatched through one GitHub client")
+
+@pytest.mark.parametrize("fail_on_error", ["true", "false"])
+def test_batch_reports_failed_records(monkeypatch, fail_on_error):
+    """Test that failed records are reported individually instead of failing the whole batch"""
+    monkeypatch.setenv("FAIL_ON_ERROR", fail_on_error)
+    records = [_sqs_record(i) for i in range(4)]
+    records[3]["body"] = "not json"
+
+    with mock.patch.object(check_processor_handler, "_workflow_trigger", None), \
+            mock.patch.object(check_processor_handler, "load_config_from_s3", return_value=BATCH_CONFIG), \
+            mock.patch.object(check_processor_handler, "GitHubClient"), \
+            mock.patch.object(check_processor_handler, "WorkflowTrigger") as workflow_trigger:
+        workflow_trigger.return_value.trigger_workflow.side_effect = [True, False, True]
+        result = check_processor_handler.handler({"Records": records}, None)
+
+    assert json_io.loads(result["body"]) == {"processed": 3, "errors": 2}
+    if fail_on_error == "true":
+        assert result["batchItemFailures"] == [{"itemIdentifier": "message-1"}, {"itemIdentifier": "message-3"}]
     else:
-        print("Some imports failed. Check dependencies.\n")
+        assert "batchItemFailures" not in result
+    log.info(f"[OK] Failed records reported with FAIL_ON_ERROR={fail_on_error}")
+
 
-    return success
+def test_workflow_config():
+    """Test that the example event config parses and maps at least one event"""
+    log.info("Testing workflow configuration...")
+
+    assert CONFIG_PATH.exists(), f"Config file not found at {CONFIG_PATH}"
+    config = json_io.loads(CONFIG_PATH.read_bytes())
+
+    mappings = config.get('event_mappings')
+    assert mappings, "No event mappings configured"
+    for mapping in mappings:
+        assert mapping.get('event_type'), f"Event mapping without event_type: {mapping}"
+    log.info(f"[OK] Config loaded with {len(mappings)} event mappings")
+
+
+# Modules the Lambda packages are expected to ship
+MODULE_CHECKS = [
+    "webhook_handler.handler",
+    "check_processor.handler",
+    "common.signature_validator",
+    "common.github_client",
+    "common.workflow_trigger",
+    "common.json_io",
+]
+
+# Lambda entry points, as configured in Terraform
+ENTRY_POINTS = [
+    ("webhook_handler.handler", "handler"),
+    ("check_processor.handler", "handler"),
+]
+
+@pytest.mark.parametrize("module_name", MODULE_CHECKS)
+def test_modules_present(module_name):
+    """Test that the Lambda modules are importable, without executing them"""
+    spec = importlib.util.find_spec(module_name)
+    assert spec is not None, f"{module_name} not found"
+
+    # Both Lambdas ship a handler.py; each must resolve to its own file, not a namesake
+    expected_file = SRC.joinpath(*module_name.split('.')).with_suffix('.py')
+    assert Path(spec.origin).resolve() == expected_file, f"{module_name} resolves to {spec.origin}"
+    log.info(f"[OK] {module_name} found")
+
+@pytest.mark.parametrize("module_name, attribute", ENTRY_POINTS)
+def test_imports(module_name, attribute):
+    """Test that the Lambda handler modules import and expose their entry points"""
+    module = importlib.import_module(module_name)
+    assert callable(getattr(module, attribute, None)), f"{module_name} has no callable {attribute}"
+    log.info(f"[OK] {module_name}.{attribute} imported")
+
+@functools.lru_cache(maxsize=None)
+def _src_tree() -> dict:
+    """Map each directory under src/ to its file names, from one os.walk; cached per session"""
+    tree = {}
+    for dirpath, dirnames, filenames in os.walk(SRC):
+        dirnames[:] = [d for d in dirnames if d != "__pycache__"]
+        tree[dirpath] = frozenset(filenames)
+    return tree
 
 def test_lambda_structure():
     """Test that Lambda directory structure is correct"""
-    print("Testing Lambda directory structure...")
-
-    src_dir = project_root / "src"
-
-    # Check webhook_handler structure
-    webhook_handler_dir = src_dir / "webhook_handler"
-    if webhook_handler_dir.exists():
-        print(f"[OK] webhook_handler directory exists")
-        if (webhook_handler_dir / "handler.py").exists():
-            print(f"  - handler.py found")
-        if (webhook_handler_dir / "requirements.txt").exists():
-            print(f"  - requirements.txt found")
-    else:
-        print(f"[FAIL] webhook_handler directory not found")
-
-    # Check check_processor structure
-    check_processor_dir = src_dir / "check_processor"
-    if check_processor_dir.exists():
-        print(f"[OK] check_processor directory exists")
-        if (check_processor_dir / "handler.py").exists():
-            print(f"  - handler.py found")
-        if (check_processor_dir / "requirements.txt").exists():
-            print(f"  - requirements.txt found")
-    else:
-        print(f"[FAIL] check_processor directory not found")
+    log.info("Testing Lambda directory structure...")
+
+    tree = _src_tree()
+    found = _discover()
+
+    # Check the Lambda package structures
+    for name, lambda_dir in (("webhook_handler", found['webhook']), ("check_processor", found['check'])):
+        files = tree.get(str(lambda_dir))
+        assert files is not None, f"{name} directory not found"
+        missing = {"handler.py", "requirements.txt"} - files
+        assert not missing, f"{name} is missing {sorted(missing)}"
+        log.info(f"[OK] {name} has handler.py and requirements.txt")
 
     # Check common utilities
-    common_dir = src_dir / "common"
-    if common_dir.exists():
-        print(f"[OK] common directory exists")
-        for file in ["github_client.py", "workflow_trigger.py"]:
-            if (common_dir / file).exists():
-                print(f"  - {file} found")
-    else:
-        print(f"[FAIL] common directory not found")
-
-    print()
-
-def main():
-    """Run all tests"""
-    print("=" * 50)
-    print("GitHub App Webhook Listener - Local Test Suite")
-    print("=" * 50)
-    print()
-
-    # Test directory structure
-    test_lambda_structure()
-
-    # Test imports
-    if not test_imports():
-        print("Fix import errors before proceeding")
-        return 1
-
-    # Test individual components
-    test_signature_validation()
-    test_workflow_config()
-
-    # Test event structures
-    test_check_suite_event()
-    test_pull_request_event()
-    test_pull_request_closed_merged_event()
-    test_pull_request_closed_not_merged_event()
-    test_merge_group_checks_requested_event()
-    test_merge_group_template_variables()
-    test_push_event_with_file_changes()
-    test_push_event_changed_files_extraction()
-
-    print("=" * 50)
-    print("All local tests passed! [OK]")
-    print("=" * 50)
-    print("\nNext steps:")
-    print("1. Update terraform/environments/your-app.tfvars with actual values")
-    print("2. Run: cd terraform && terraform init")
-    print("3. Run: terraform plan -var-file=environments/your-app.tfvars")
-    print("4. Run: terraform apply -var-file=environments/your-app.tfvars")
-    print("5. Update GitHub App webhook URL with the output URL")
-
-    return 0
+    common_files = tree.get(str(COMMON_DIR))
+    assert common_files is not None, "common directory not found"
+    missing = {"github_client.py", "workflow_trigger.py"} - common_files
+    assert not missing, f"common is missing {sorted(missing)}"
+    log.info("[OK] common has github_client.py and workflow_trigger.py")
+
 
 if __name__ == "__main__":
-    sys.exit(main())
\ No newline at end of file
+    sys.exit(pytest.main([__file__, "-n", "auto"]))